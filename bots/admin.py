@@ -1,10 +1,17 @@
 from django.contrib import admin
+from django.db.models.functions import Substr
 from .models import ConversationalBot, Conversation, Message, GoogleCloudTTSUsage
 
 
+def _is_changelist(request):
+    """Whether the request is for an admin changelist page (not a change/delete form)"""
+    match = request.resolver_match
+    return match is not None and (match.url_name or '').endswith('_changelist')
+
+
 @admin.register(ConversationalBot)
 class ConversationalBotAdmin(admin.ModelAdmin):
-    list_display = ['name', 'temperature', 'voice_name', 'is_active', 'created_at']
+    list_display = ['name', 'temperature', 'voice_name', 'conversation_count', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at', 'voice_name']
     search_fields = ['name', 'system_prompt']
     readonly_fields = ['id', 'created_at', 'updated_at']
@@ -21,6 +28,19 @@ class ConversationalBotAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if not _is_changelist(request):
+            # The change form needs system_prompt and no conversation stats
+            return queryset
+        # The changelist never renders system_prompt; searching it still works in SQL
+        return queryset.defer('system_prompt').with_stats()
+
+    def conversation_count(self, obj):
+        return obj.conversation_count
+    conversation_count.short_description = 'Conversations'
+    conversation_count.admin_order_field = 'n_conversations'
+
 
 @admin.register(Conversation)
 class ConversationAdmin(admin.ModelAdmin):
@@ -28,6 +48,7 @@ class ConversationAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'started_at', 'bot']
     search_fields = ['session_id', 'bot__name']
     readonly_fields = ['id', 'started_at', 'last_activity']
+    list_select_related = ['bot']
 
 
 @admin.register(Message)
@@ -36,9 +57,22 @@ class MessageAdmin(admin.ModelAdmin):
     list_filter = ['message_type', 'timestamp']
     search_fields = ['content', 'conversation__session_id']
     readonly_fields = ['id', 'timestamp']
+    # Conversation.__str__ renders the bot name, so join both levels
+    list_select_related = ['conversation__bot']
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if not _is_changelist(request):
+            # The change form shows the full content
+            return queryset
+        # Only pull the first 51 characters of content - enough to know whether
+        # the preview needs an ellipsis - instead of the full TEXT column
+        return queryset.annotate(
+            preview=Substr('content', 1, 51)
+        ).defer('content')
 
     def content_preview(self, obj):
-        return obj.content[:50] + "..." if len(obj.content) > 50 else obj.content
+        return obj.preview[:50] + "..." if len(obj.preview) > 50 else obj.preview
     content_preview.short_description = 'Content Preview'
 
     def has_audio(self, obj):
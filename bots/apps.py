@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BotsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bots'
+
+    def ready(self):
+        # Register signal handlers (cache invalidation on bot changes)
+        from . import signals  # noqa: F401
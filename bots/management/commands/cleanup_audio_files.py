@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from bots.utils import cleanup_old_audio_files
+
+
+class Command(BaseCommand):
+    help = 'Delete generated audio files older than the given number of days'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=7,
+            help='Delete files last modified more than this many days ago (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        # Run from cron or a scheduler so deletions never block request threads
+        deleted = cleanup_old_audio_files(days_old=options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} old audio file(s)'))
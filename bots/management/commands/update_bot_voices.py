@@ -1,4 +1,8 @@
+from itertools import islice
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 from bots.models import ConversationalBot
 from bots.services import VoiceSelectionService
 
@@ -6,36 +10,57 @@ from bots.services import VoiceSelectionService
 class Command(BaseCommand):
     help = 'Update existing bots with AI-selected voices'
 
+    # Bots fetched per DB round-trip and sent through one AI client session
+    chunk_size = 200
+
     def handle(self, *args, **options):
         bots = ConversationalBot.objects.filter(is_active=True)
         updated_count = 0
-        
-        for bot in bots:
-            old_voice = bot.voice_name
-            new_voice = VoiceSelectionService.select_voice_for_bot(
-                bot.name,
-                bot.system_prompt
+
+        # Stream rows instead of caching the whole queryset, and only load the
+        # columns voice selection needs
+        bots = bots.only('id', 'name', 'system_prompt', 'voice_name')
+        bots = bots.iterator(chunk_size=self.chunk_size)
+        while chunk := list(islice(bots, self.chunk_size)):
+            changed = []
+            new_voices = VoiceSelectionService.select_voices_for_bots(
+                [(bot.name, bot.system_prompt) for bot in chunk]
             )
 
-            if old_voice != new_voice:
-                bot.voice_name = new_voice
-                bot.save()
-                
-                old_name = VoiceSelectionService.get_voice_name(old_voice) if old_voice else 'None'
-                new_name = VoiceSelectionService.get_voice_name(new_voice)
-                
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Updated "{bot.name}": {old_name} → {new_name}'
+            for bot, new_voice in zip(chunk, new_voices):
+                old_voice = bot.voice_name
+
+                if old_voice != new_voice:
+                    # bulk_update() bypasses auto_now, so stamp updated_at manually
+                    bot.voice_name = new_voice
+                    bot.updated_at = timezone.now()
+                    changed.append(bot)
+                    
+                    old_name = VoiceSelectionService.get_voice_name(old_voice) if old_voice else 'None'
+                    new_name = VoiceSelectionService.get_voice_name(new_voice)
+                    
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f'Updated "{bot.name}": {old_name} → {new_name}'
+                        )
                     )
+                else:
+                    voice_name = VoiceSelectionService.get_voice_name(new_voice)
+                    self.stdout.write(
+                        f'"{bot.name}": Already using optimal voice ({voice_name})'
+                    )
+
+                # Show progress per bot; each one may wait on an AI call
+                self.stdout.flush()
+
+            # Write this chunk's voice changes before the next AI calls, so
+            # memory stays constant and a later failure keeps earlier work
+            with transaction.atomic():
+                ConversationalBot.objects.bulk_update(
+                    changed, ['voice_name', 'updated_at'], batch_size=500
                 )
-                updated_count += 1
-            else:
-                voice_name = VoiceSelectionService.get_voice_name(new_voice)
-                self.stdout.write(
-                    f'"{bot.name}": Already using optimal voice ({voice_name})'
-                )
-        
+            updated_count += len(changed)
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'\nCompleted! Updated {updated_count} bot(s) with AI-selected voices.'
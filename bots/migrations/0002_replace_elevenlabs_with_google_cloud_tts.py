@@ -1,4 +1,10 @@
 # Generated migration for replacing ElevenLabs with Google Cloud TTS
+#
+# Schema operations only - voice_id values carry over through the rename, so no
+# per-row data migration is needed. Any follow-up data migration should update
+# rows server-side (queryset.update() or RunSQL) rather than calling save() per
+# row; if per-row logic is unavoidable, stream with iterator(chunk_size=...) and
+# write with bulk_update(), as 0007_conversation_session_uuid does.
 
 from django.db import migrations, models
 import uuid
@@ -0,0 +1,21 @@
+# Indexes for ordered chat history and per-bot conversation listing
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bots', '0003_alter_conversationalbot_voice_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['bot', '-last_activity'], name='conv_bot_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp'], name='msg_conv_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Partial index for counting a bot's active conversations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bots', '0004_add_conversation_and_message_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['bot', 'is_active'], name='conv_bot_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Partial index for listing active bots newest first
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bots', '0005_conversation_conv_bot_active_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversationalbot',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='bot_active_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Add a fixed-size session_uuid key derived from session_id
+
+import uuid
+
+from django.db import migrations, models
+
+# Must match bots.models.SESSION_UUID_NAMESPACE
+SESSION_UUID_NAMESPACE = uuid.UUID('d91ce7ed-da93-4ebb-b2ad-31d5a7989bc1')
+
+
+def populate_session_uuid(apps, schema_editor):
+    """Backfill session_uuid for existing conversations in batches"""
+    Conversation = apps.get_model('bots', 'Conversation')
+    batch = []
+    for conversation in Conversation.objects.only('id', 'session_id').iterator(chunk_size=2000):
+        conversation.session_uuid = uuid.uuid5(SESSION_UUID_NAMESPACE, conversation.session_id)
+        batch.append(conversation)
+        if len(batch) >= 500:
+            Conversation.objects.bulk_update(batch, ['session_uuid'])
+            batch = []
+    if batch:
+        Conversation.objects.bulk_update(batch, ['session_uuid'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bots', '0006_conversationalbot_bot_active_recent_idx'),
+    ]
+
+    operations = [
+        # Add as nullable first so existing rows can be backfilled
+        migrations.AddField(
+            model_name='conversation',
+            name='session_uuid',
+            field=models.UUIDField(editable=False, null=True, help_text='UUID derived from session_id, used for fast session resolution'),
+        ),
+        migrations.RunPython(populate_session_uuid, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='conversation',
+            name='session_uuid',
+            field=models.UUIDField(editable=False, unique=True, help_text='UUID derived from session_id, used for fast session resolution'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Replace unique_together on month with a named UniqueConstraint used for upserts
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bots', '0007_conversation_session_uuid'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='googlecloudttsusage',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='googlecloudttsusage',
+            constraint=models.UniqueConstraint(fields=('month',), name='uniq_tts_month'),
+        ),
+    ]
@@ -1,9 +1,51 @@
 # Django core imports for database models and utilities
-from django.db import models
-from django.contrib.auth.models import User
+from django.db import connection, models
+from django.db.models import Count, Q
 from django.utils import timezone
+from collections import Counter
+import atexit
+import logging
+import threading
+import time
 import uuid
 
+logger = logging.getLogger(__name__)
+
+
+class ConversationalBotQuerySet(models.QuerySet):
+    """Custom queryset helpers for ConversationalBot"""
+
+    def with_stats(self):
+        """
+        Annotate each bot with its active conversation count.
+
+        Cheaper than with_counts() for list views that don't show message
+        totals, since it only joins conversations.
+
+        Returns:
+            QuerySet: Bots annotated with ``n_conversations``
+        """
+        return self.annotate(
+            n_conversations=Count('conversations', filter=Q(conversations__is_active=True)),
+        )
+
+    def with_counts(self):
+        """
+        Annotate each bot with its active conversation and message counts.
+
+        Both counts are computed in a single aggregated query, so listing many
+        bots no longer issues one COUNT per bot (or per conversation).
+
+        Returns:
+            QuerySet: Bots annotated with ``n_conversations`` and ``n_messages``
+        """
+        active = Q(conversations__is_active=True)
+        return self.annotate(
+            # distinct=True because the messages join multiplies conversation rows
+            n_conversations=Count('conversations', filter=active, distinct=True),
+            n_messages=Count('conversations__messages', filter=active),
+        )
+
 
 class ConversationalBot(models.Model):
     """
@@ -72,11 +114,18 @@ class ConversationalBot(models.Model):
                  "Inactive bots are hidden from users but data is preserved."
     )
 
+    objects = ConversationalBotQuerySet.as_manager()
+
     class Meta:
         # Order bots by creation date (newest first) for better UX
         ordering = ['-created_at']
         verbose_name = "Conversational Bot"
         verbose_name_plural = "Conversational Bots"
+        indexes = [
+            # Landing page lists active bots newest first; partial index keeps
+            # soft-deleted bots out of it
+            models.Index(fields=['-created_at'], name='bot_active_recent_idx', condition=Q(is_active=True)),
+        ]
 
     def __str__(self):
         """String representation for admin interface and debugging"""
@@ -86,6 +135,9 @@ class ConversationalBot(models.Model):
         """
         Get human-readable voice name for display in UI.
 
+        VoiceSelectionService.get_voice_name() memoizes the lookup, so
+        repeated template references stay cheap.
+
         Returns:
             str: Formatted voice name with gender and personality traits
         """
@@ -95,12 +147,24 @@ class ConversationalBot(models.Model):
     @property
     def conversation_count(self):
         """Get the total number of conversations for this bot"""
+        # Prefer the value annotated by ConversationalBot.objects.with_counts()
+        n_conversations = getattr(self, 'n_conversations', None)
+        if n_conversations is not None:
+            return n_conversations
         return self.conversations.filter(is_active=True).count()
 
     @property
     def message_count(self):
         """Get the total number of messages across all conversations for this bot"""
-        return sum(conv.messages.count() for conv in self.conversations.filter(is_active=True))
+        n_messages = getattr(self, 'n_messages', None)
+        if n_messages is not None:
+            return n_messages
+        # Single COUNT across the join instead of one query per conversation
+        return Message.objects.filter(conversation__bot=self, conversation__is_active=True).count()
+
+
+# Namespace for deriving Conversation.session_uuid from browser session IDs
+SESSION_UUID_NAMESPACE = uuid.UUID('d91ce7ed-da93-4ebb-b2ad-31d5a7989bc1')
 
 
 class Conversation(models.Model):
@@ -143,6 +207,14 @@ class Conversation(models.Model):
                  "Allows conversation persistence without user authentication."
     )
 
+    # Fixed-size key derived from session_id - used for session lookups since
+    # a 16-byte UUID index is much smaller than the variable-length string one
+    session_uuid = models.UUIDField(
+        unique=True,
+        editable=False,
+        help_text="UUID derived from session_id, used for fast session resolution"
+    )
+
     # Conversation lifecycle timestamps
     started_at = models.DateTimeField(
         auto_now_add=True,
@@ -166,11 +238,42 @@ class Conversation(models.Model):
         ordering = ['-last_activity']
         verbose_name = "Conversation"
         verbose_name_plural = "Conversations"
+        indexes = [
+            # Recent conversations for a bot, matching the default ordering
+            models.Index(fields=['bot', '-last_activity'], name='conv_bot_activity_idx'),
+            # Active conversations per bot (conversation_count); partial so the
+            # index only holds rows that are still visible
+            models.Index(fields=['bot', 'is_active'], name='conv_bot_active_idx', condition=Q(is_active=True)),
+        ]
 
     def __str__(self):
         """String representation showing bot name and session ID"""
         return f"Conversation with {self.bot.name} - {self.session_id[:8]}..."
 
+    def save(self, *args, **kwargs):
+        """Derive session_uuid from session_id before saving"""
+        if self.session_id:
+            # Always recompute, so editing session_id (e.g. in the admin)
+            # can't leave a stale lookup key behind
+            self.session_uuid = self.uuid_for_session(self.session_id)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'session_id' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'session_uuid'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def uuid_for_session(session_id):
+        """
+        Map a browser session ID to the UUID stored in session_uuid.
+
+        Args:
+            session_id (str): Session identifier from the user's browser session
+
+        Returns:
+            uuid.UUID: Deterministic UUID for the session ID
+        """
+        return uuid.uuid5(SESSION_UUID_NAMESPACE, session_id)
+
 
 class Message(models.Model):
     """
@@ -243,6 +346,10 @@ class Message(models.Model):
         ordering = ['timestamp']
         verbose_name = "Message"
         verbose_name_plural = "Messages"
+        indexes = [
+            # Chat history is always read per conversation in timestamp order
+            models.Index(fields=['conversation', 'timestamp'], name='msg_conv_ts_idx'),
+        ]
 
     def __str__(self):
         """String representation showing message type and content preview"""
@@ -298,8 +405,10 @@ class GoogleCloudTTSUsage(models.Model):
     )
 
     class Meta:
-        # Ensure only one record per month
-        unique_together = ['month']
+        # Ensure only one record per month (also the upsert conflict target)
+        constraints = [
+            models.UniqueConstraint(fields=['month'], name='uniq_tts_month'),
+        ]
         # Order by most recent month first
         ordering = ['-month']
         verbose_name = "Google Cloud TTS Usage"
@@ -339,12 +448,132 @@ class GoogleCloudTTSUsage(models.Model):
         """
         return self.characters_used >= self.characters_limit
 
-    def add_usage(self, characters):
+    def add_usage(self, characters, refresh=False):
         """
         Add character usage to this month's total.
 
+        Increments are buffered in-process and written in batches by
+        flush_usage(), so the single monthly row isn't updated on every
+        synthesis. The buffer is flushed once it holds USAGE_FLUSH_CHARACTERS
+        characters or USAGE_FLUSH_INTERVAL seconds have passed.
+
         Args:
             characters (int): Number of characters to add to usage
+            refresh (bool): Flush now and reload characters_used/last_updated
+        """
+        self.record_usage(characters, month=self.month, flush=refresh)
+        if refresh:
+            self.refresh_from_db(fields=['characters_used', 'last_updated'])
+        else:
+            # Keep this instance's limit checks current until the next flush
+            self.characters_used += characters
+
+    @classmethod
+    def record_usage(cls, characters, month=None, flush=False):
         """
-        self.characters_used += characters
-        self.save(update_fields=['characters_used', 'last_updated'])
+        Buffer character usage for a month without loading its record.
+
+        The month's row is created on flush if it doesn't exist yet.
+
+        Args:
+            characters (int): Number of characters to add to usage
+            month (date, optional): Month to charge; defaults to the current month
+            flush (bool): Write the buffer to the database immediately
+        """
+        if month is None:
+            month = timezone.now().date().replace(day=1)
+
+        with _pending_usage_lock:
+            _pending_usage[month] += characters
+            due = (
+                sum(_pending_usage.values()) >= USAGE_FLUSH_CHARACTERS
+                or time.monotonic() - _last_usage_flush >= USAGE_FLUSH_INTERVAL
+            )
+
+        if due or flush:
+            flush_usage()
+
+    @classmethod
+    def _upsert_usage(cls, month, characters, now):
+        """
+        Add characters to a month's total in a single INSERT ... ON CONFLICT.
+
+        Creates the month's row if needed, otherwise increments it atomically,
+        so there is no SELECT and no race between concurrent writers.
+        Supported by PostgreSQL and SQLite (3.24+).
+        """
+        opts = cls._meta
+        table = connection.ops.quote_name(opts.db_table)
+        fields = [opts.get_field(name) for name in
+                  ('id', 'month', 'characters_used', 'characters_limit', 'last_updated')]
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        used = connection.ops.quote_name(opts.get_field('characters_used').column)
+        updated = connection.ops.quote_name(opts.get_field('last_updated').column)
+        month_column = connection.ops.quote_name(opts.get_field('month').column)
+
+        values = (uuid.uuid4(), month, characters, fields[3].get_default(), now)
+        params = [field.get_db_prep_value(value, connection) for field, value in zip(fields, values)]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES (%s, %s, %s, %s, %s) "
+                f"ON CONFLICT ({month_column}) DO UPDATE SET "
+                f"{used} = {table}.{used} + EXCLUDED.{used}, "
+                f"{updated} = EXCLUDED.{updated}",
+                params,
+            )
+
+
+# ========================================
+# BUFFERED TTS USAGE ACCOUNTING
+# ========================================
+
+# Flush thresholds for buffered GoogleCloudTTSUsage increments
+USAGE_FLUSH_CHARACTERS = 5000
+USAGE_FLUSH_INTERVAL = 60  # seconds
+
+# Pending character counts keyed by usage month
+_pending_usage = Counter()
+_pending_usage_lock = threading.Lock()
+_last_usage_flush = time.monotonic()
+
+
+def flush_usage():
+    """
+    Write buffered TTS usage increments to the database.
+
+    Issues one upsert per month, regardless of how many syntheses were
+    recorded since the last flush.
+    """
+    global _last_usage_flush
+    with _pending_usage_lock:
+        pending = dict(_pending_usage)
+        _pending_usage.clear()
+        _last_usage_flush = time.monotonic()
+
+    now = timezone.now()
+    while pending:
+        month, characters = next(iter(pending.items()))
+        try:
+            GoogleCloudTTSUsage._upsert_usage(month, characters, now)
+        except Exception:
+            # Put the unwritten counts back so the next flush retries them
+            with _pending_usage_lock:
+                _pending_usage.update(pending)
+            raise
+        del pending[month]
+
+
+def _flush_usage_at_exit():
+    """Flush buffered usage on shutdown, logging (not raising) if it can't be written"""
+    try:
+        flush_usage()
+    except Exception as e:
+        logger.error(
+            "Dropped %s buffered TTS usage characters at shutdown: %s",
+            sum(_pending_usage.values()), e
+        )
+
+
+# Don't lose buffered usage when the worker process shuts down
+atexit.register(_flush_usage_at_exit)
@@ -0,0 +1,12 @@
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ConversationalBot
+
+
+@receiver(post_save, sender=ConversationalBot)
+@receiver(post_delete, sender=ConversationalBot)
+def invalidate_view_cache(sender, **kwargs):
+    """Drop cached pages (e.g. the bot list) whenever a bot is created, edited or deleted"""
+    caches['views'].clear()
@@ -5,6 +5,24 @@ import re
 
 register = template.Library()
 
+# Patterns compiled once at import instead of on every rendered message
+_BOLD_STAR_RE = re.compile(r'\*\*(.*?)\*\*')
+_BOLD_UNDERSCORE_RE = re.compile(r'__(.*?)__')
+_ITALIC_STAR_RE = re.compile(r'\*(.*?)\*')
+_ITALIC_UNDERSCORE_RE = re.compile(r'_(.*?)_')
+_CODE_BLOCK_RE = re.compile(r'```([\s\S]*?)```')
+_INLINE_CODE_RE = re.compile(r'`(.*?)`')
+_H3_RE = re.compile(r'^### (.*$)', re.MULTILINE)
+_H2_RE = re.compile(r'^## (.*$)', re.MULTILINE)
+_H1_RE = re.compile(r'^# (.*$)', re.MULTILINE)
+# List item: group 1 is set for bullets (- * +), group 2 for numbers (1.),
+# and group 3 holds the item text
+_LIST_ITEM_RE = re.compile(r'^[\s]*(?:([-*+])|(\d+)\.)\s+(.*)')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+_BLOCK_ELEMENT_RE = re.compile(r'^<(h[1-6]|pre|blockquote)')
+_EMPTY_PARAGRAPH_RE = re.compile(r'<p>\s*</p>')
+
 @register.filter
 def markdown(text):
     """Convert markdown text to HTML"""
@@ -16,23 +34,23 @@ def markdown(text):
     
     # Convert markdown to HTML
     # Bold text **text** or __text__
-    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-    text = re.sub(r'__(.*?)__', r'<strong>\1</strong>', text)
+    text = _BOLD_STAR_RE.sub(r'<strong>\1</strong>', text)
+    text = _BOLD_UNDERSCORE_RE.sub(r'<strong>\1</strong>', text)
     
     # Italic text *text* or _text_
-    text = re.sub(r'\*(.*?)\*', r'<em>\1</em>', text)
-    text = re.sub(r'_(.*?)_', r'<em>\1</em>', text)
+    text = _ITALIC_STAR_RE.sub(r'<em>\1</em>', text)
+    text = _ITALIC_UNDERSCORE_RE.sub(r'<em>\1</em>', text)
     
     # Code blocks ```code```
-    text = re.sub(r'```([\s\S]*?)```', r'<pre><code>\1</code></pre>', text)
+    text = _CODE_BLOCK_RE.sub(r'<pre><code>\1</code></pre>', text)
     
     # Inline code `code`
-    text = re.sub(r'`(.*?)`', r'<code>\1</code>', text)
+    text = _INLINE_CODE_RE.sub(r'<code>\1</code>', text)
     
     # Headers
-    text = re.sub(r'^### (.*$)', r'<h6>\1</h6>', text, flags=re.MULTILINE)
-    text = re.sub(r'^## (.*$)', r'<h5>\1</h5>', text, flags=re.MULTILINE)
-    text = re.sub(r'^# (.*$)', r'<h4>\1</h4>', text, flags=re.MULTILINE)
+    text = _H3_RE.sub(r'<h6>\1</h6>', text)
+    text = _H2_RE.sub(r'<h5>\1</h5>', text)
+    text = _H1_RE.sub(r'<h4>\1</h4>', text)
     
     # Process lists first, before paragraph processing
     # Handle empty lines between list items to keep them in the same list
@@ -45,36 +63,33 @@ def markdown(text):
     while i < len(lines):
         line = lines[i]
 
-        # Check for bullet points
-        bullet_match = re.match(r'^[\s]*[-*+]\s+(.*)', line)
-        # Check for numbered lists
-        number_match = re.match(r'^[\s]*\d+\.\s+(.*)', line)
+        # Check for bullet points and numbered lists in one match
+        item_match = _LIST_ITEM_RE.match(line)
 
-        if bullet_match:
+        if item_match and item_match.group(1):
             if not in_bullet_list:
                 if in_numbered_list:
                     processed_lines.append('</ol>')
                     in_numbered_list = False
                 processed_lines.append('<ul>')
                 in_bullet_list = True
-            processed_lines.append(f'<li>{bullet_match.group(1)}</li>')
-        elif number_match:
+            processed_lines.append(f'<li>{item_match.group(3)}</li>')
+        elif item_match:
             if not in_numbered_list:
                 if in_bullet_list:
                     processed_lines.append('</ul>')
                     in_bullet_list = False
                 processed_lines.append('<ol>')
                 in_numbered_list = True
-            processed_lines.append(f'<li>{number_match.group(1)}</li>')
+            processed_lines.append(f'<li>{item_match.group(3)}</li>')
         else:
             # Check if this is an empty line followed by another list item
             if line.strip() == '' and i + 1 < len(lines):
-                next_line = lines[i + 1]
-                next_bullet = re.match(r'^[\s]*[-*+]\s+(.*)', next_line)
-                next_number = re.match(r'^[\s]*\d+\.\s+(.*)', next_line)
+                next_item = _LIST_ITEM_RE.match(lines[i + 1])
 
                 # If next line is a list item of the same type, skip this empty line
-                if (in_bullet_list and next_bullet) or (in_numbered_list and next_number):
+                if next_item and ((in_bullet_list and next_item.group(1)) or
+                                  (in_numbered_list and next_item.group(2))):
                     i += 1
                     continue
 
@@ -98,11 +113,11 @@ def markdown(text):
     text = '\n'.join(processed_lines)
     
     # Links [text](url)
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" target="_blank">\1</a>', text)
+    text = _LINK_RE.sub(r'<a href="\2" target="_blank">\1</a>', text)
     
     # Handle paragraphs more carefully to preserve list structures
     # Split by double line breaks but preserve list blocks
-    sections = re.split(r'\n\s*\n', text)
+    sections = _PARAGRAPH_BREAK_RE.split(text)
     formatted_sections = []
 
     for section in sections:
@@ -112,7 +127,7 @@ def markdown(text):
             if '<ol>' in section or '<ul>' in section or section.startswith('<li>'):
                 # This is a list section, don't wrap in paragraphs
                 formatted_sections.append(section)
-            elif re.match(r'^<(h[1-6]|pre|blockquote)', section):
+            elif _BLOCK_ELEMENT_RE.match(section):
                 # This is already a block element
                 formatted_sections.append(section)
             else:
@@ -123,6 +138,6 @@ def markdown(text):
     text = '\n\n'.join(formatted_sections)
     
     # Clean up empty paragraphs
-    text = re.sub(r'<p>\s*</p>', '', text)
+    text = _EMPTY_PARAGRAPH_RE.sub('', text)
     
     return mark_safe(text)
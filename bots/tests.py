@@ -1,3 +1,275 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from importlib import import_module
+import tempfile
+from unittest import mock
+import uuid
 
-# Create your tests here.
+from django.apps import apps
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Conversation, ConversationalBot, GoogleCloudTTSUsage, Message,
+    _flush_usage_at_exit, _pending_usage, flush_usage,
+)
+from .services import ConversationManager, VoiceSelectionService, markdown_to_clean_text
+from .views import CHAT_HISTORY_PAGE_SIZE, SendMessageView
+
+# Per-test in-memory caches, so test runs never read or clear the on-disk
+# caches used by the dev server
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}'}
+    for alias in ('default', 'views', 'tts')
+}
+
+# Pages render {% static %} without a collectstatic manifest
+PLAIN_STATIC_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class GoogleCloudTTSUsageTests(TestCase):
+    """Buffered usage accounting and the month upsert"""
+
+    def setUp(self):
+        _pending_usage.clear()
+
+    def test_record_usage_sums_into_single_month_row(self):
+        month = date(2025, 1, 1)
+
+        GoogleCloudTTSUsage.record_usage(120, month=month, flush=True)
+        GoogleCloudTTSUsage.record_usage(80, month=month, flush=True)
+
+        usage = GoogleCloudTTSUsage.objects.get(month=month)
+        self.assertEqual(GoogleCloudTTSUsage.objects.filter(month=month).count(), 1)
+        self.assertEqual(usage.characters_used, 200)
+
+    def test_failed_flush_requeues_counts(self):
+        month = date(2025, 1, 1)
+        _pending_usage[month] = 120
+
+        with mock.patch.object(GoogleCloudTTSUsage, '_upsert_usage', side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                flush_usage()
+
+        self.assertEqual(_pending_usage[month], 120)
+        flush_usage()
+        self.assertEqual(GoogleCloudTTSUsage.objects.get(month=month).characters_used, 120)
+
+    def test_exit_flush_logs_dropped_counts(self):
+        _pending_usage[date(2025, 1, 1)] = 120
+
+        with mock.patch.object(GoogleCloudTTSUsage, '_upsert_usage', side_effect=RuntimeError("db down")):
+            with self.assertLogs('bots.models', level='ERROR') as logs:
+                _flush_usage_at_exit()
+
+        self.assertIn("Dropped 120 buffered TTS usage characters", logs.output[0])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ConversationSessionUUIDTests(TestCase):
+    """session_uuid always matches the conversation's session_id"""
+
+    def setUp(self):
+        self.bot = ConversationalBot.objects.create(name="Test Bot", system_prompt="Be helpful.")
+
+    def test_create_derives_session_uuid(self):
+        conversation = Conversation.objects.create(bot=self.bot, session_id="session-a")
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.session_uuid, Conversation.uuid_for_session("session-a"))
+
+    def test_editing_session_id_updates_session_uuid(self):
+        conversation = Conversation.objects.create(bot=self.bot, session_id="session-a")
+
+        conversation.session_id = "session-b"
+        conversation.save(update_fields=['session_id'])
+
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.session_uuid, Conversation.uuid_for_session("session-b"))
+
+    def test_migration_backfill_matches_model(self):
+        conversation = Conversation.objects.create(bot=self.bot, session_id="session-a")
+        Conversation.objects.filter(pk=conversation.pk).update(session_uuid=uuid.uuid4())
+
+        migration = import_module('bots.migrations.0007_conversation_session_uuid')
+        migration.populate_session_uuid(apps, None)
+
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.session_uuid, Conversation.uuid_for_session("session-a"))
+
+
+class MarkdownToCleanTextTests(SimpleTestCase):
+    """Emoji removal via the Unicode-range character class"""
+
+    def test_strips_emoji_from_each_range(self):
+        emojis = {
+            'emoticons (U+1F600-1F64F)': '\U0001F600',
+            'symbols & pictographs (U+1F300-1F5FF)': '\U0001F300',
+            'transport & map (U+1F680-1F6FF)': '\U0001F680',
+            'regional indicators (U+1F1E6-1F1FF)': '\U0001F1FA',
+            'misc symbols & dingbats (U+2640-27BF)': '\u2705',
+        }
+        for label, emoji in emojis.items():
+            with self.subTest(label):
+                self.assertEqual(markdown_to_clean_text(f"Hello {emoji} world"), "Hello world")
+
+
+@override_settings(CACHES=TEST_CACHES, STORAGES=PLAIN_STATIC_STORAGES)
+class ChatHistoryViewTests(TestCase):
+    """Paging older messages for the browser session's conversation"""
+
+    def setUp(self):
+        self.bot = ConversationalBot.objects.create(name="Test Bot", system_prompt="Be helpful.")
+        self.chat_url = reverse('chat', args=[self.bot.id])
+        self.history_url = reverse('chat_history', args=[self.bot.id])
+
+    def start_conversation(self):
+        """Open the chat page so the session is tied to a conversation"""
+        self.client.get(self.chat_url)
+        return Conversation.objects.get(bot=self.bot)
+
+    def add_messages(self, conversation, count):
+        """Create messages one second apart, oldest first"""
+        start = timezone.now() - timedelta(days=1)
+        for i in range(count):
+            message = Message.objects.create(conversation=conversation, message_type='user', content=f"Message {i}")
+            Message.objects.filter(pk=message.pk).update(timestamp=start + timedelta(seconds=i))
+
+    def test_malformed_before_is_bad_request(self):
+        self.start_conversation()
+        response = self.client.get(self.history_url, {'before': 'not-a-uuid'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_missing_session_is_bad_request(self):
+        response = self.client.get(self.history_url, {'before': str(uuid.uuid4())})
+        self.assertEqual(response.status_code, 400)
+
+    def test_message_from_another_session_is_not_found(self):
+        self.start_conversation()
+        other = Conversation.objects.create(bot=self.bot, session_id="other-session")
+        other_message = Message.objects.create(conversation=other, message_type='user', content="Hello")
+
+        response = self.client.get(self.history_url, {'before': str(other_message.id)})
+        self.assertEqual(response.status_code, 404)
+
+    def test_pages_do_not_overlap(self):
+        conversation = self.start_conversation()
+        self.add_messages(conversation, CHAT_HISTORY_PAGE_SIZE + 5)
+
+        first = self.client.get(self.chat_url)
+        first_page = first.context['chat_messages']
+        self.assertTrue(first.context['has_older_messages'])
+        self.assertEqual(len(first_page), CHAT_HISTORY_PAGE_SIZE)
+
+        second = self.client.get(self.history_url, {'before': str(first_page[0].id)})
+        self.assertEqual(second.status_code, 200)
+        second_page = second.context['chat_messages']
+        self.assertFalse(second.context['has_older_messages'])
+        self.assertEqual(len(second_page), 5)
+        self.assertFalse({m.id for m in first_page} & {m.id for m in second_page})
+        self.assertLess(second_page[-1].timestamp, first_page[0].timestamp)
+
+
+@override_settings(CACHES=TEST_CACHES, STORAGES=PLAIN_STATIC_STORAGES)
+class BotDeleteViewTests(TestCase):
+    """Deleting a bot soft-deletes it"""
+
+    def test_delete_deactivates_bot_and_hides_it_from_list(self):
+        bot = ConversationalBot.objects.create(name="Test Bot", system_prompt="Be helpful.")
+        chat_url = reverse('chat', args=[bot.id])
+        self.assertContains(self.client.get(reverse('bot_list')), chat_url)
+
+        response = self.client.post(reverse('bot_delete', args=[bot.pk]))
+
+        self.assertRedirects(response, reverse('bot_list'))
+        bot.refresh_from_db()
+        self.assertFalse(bot.is_active)
+        self.assertNotContains(self.client.get(reverse('bot_list')), chat_url)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ProcessUserMessageTests(TestCase):
+    """Saving a chat turn, with GPT and TTS mocked out"""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(self.settings(MEDIA_ROOT=media_root.name))
+
+        bot = ConversationalBot.objects.create(name="Test Bot", system_prompt="Be helpful.")
+        self.conversation = Conversation.objects.create(bot=bot, session_id="session-a")
+
+        self.manager = ConversationManager()
+        self.manager.gpt_service = mock.Mock()
+        self.manager.gpt_service.generate_response.return_value = "Hi there!"
+        self.manager.tts_service = mock.Mock(audio_extension='mp3')
+
+    def test_saves_both_messages_and_audio(self):
+        self.manager.tts_service.text_to_speech.return_value = b"mp3-bytes"
+
+        result = self.manager.process_user_message(self.conversation, "Hello")
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['audio_generated'])
+        ai_message = Message.objects.get(conversation=self.conversation, message_type='ai')
+        self.assertEqual(ai_message.content, "Hi there!")
+        self.assertEqual(ai_message.audio_file.name, f"audio/response_{ai_message.id}.mp3")
+        with ai_message.audio_file.open('rb') as audio:
+            self.assertEqual(audio.read(), b"mp3-bytes")
+        self.assertTrue(Message.objects.filter(conversation=self.conversation, message_type='user', content="Hello").exists())
+
+    def test_saves_ai_message_without_audio_when_tts_fails(self):
+        self.manager.tts_service.text_to_speech.side_effect = RuntimeError("TTS down")
+
+        with self.assertLogs('bots.services', level='WARNING'):
+            result = self.manager.process_user_message(self.conversation, "Hello")
+
+        self.assertTrue(result['success'])
+        self.assertFalse(result['audio_generated'])
+        self.assertEqual(result['audio_error'], "TTS down")
+        ai_message = Message.objects.get(conversation=self.conversation, message_type='ai')
+        self.assertFalse(ai_message.audio_file)
+
+
+@override_settings(CACHES=TEST_CACHES, GITHUB_TOKEN='test-token')
+class SelectVoiceBatchTests(SimpleTestCase):
+    """Parsing the one-voice-per-line AI response for a batch of bots"""
+
+    def test_valid_lines_are_used_and_invalid_ones_fall_back(self):
+        bots = [("Captain", "A gruff sea captain."), ("Helper", "A friendly assistant."), ("Third", "A narrator.")]
+        client = mock.Mock()
+        client.complete.return_value.choices = [
+            mock.Mock(message=mock.Mock(content="1. en-US-Chirp3-HD-Charon\n\n2. not-a-voice"))
+        ]
+
+        with self.assertLogs('bots.services', level='INFO'):
+            voices = VoiceSelectionService._select_voice_batch(bots, client)
+
+        self.assertEqual(client.complete.call_count, 1)
+        self.assertEqual(voices, [
+            "en-US-Chirp3-HD-Charon",
+            VoiceSelectionService._simple_fallback(*bots[1]),
+            VoiceSelectionService._simple_fallback(*bots[2]),
+        ])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SendMessageViewTests(TestCase):
+    """Request size guard on the chat message endpoint"""
+
+    def test_oversized_body_is_rejected_before_processing(self):
+        bot = ConversationalBot.objects.create(name="Test Bot", system_prompt="Be helpful.")
+
+        with mock.patch('bots.views.get_conversation_manager') as get_manager:
+            response = self.client.post(
+                reverse('send_message', args=[bot.id]),
+                data='x' * (SendMessageView.max_body_bytes + 1),
+                content_type='application/json',
+            )
+
+        self.assertEqual(response.status_code, 413)
+        get_manager.assert_not_called()
+        self.assertFalse(Message.objects.exists())
@@ -11,5 +11,6 @@ urlpatterns = [
     # Chat URLs
     path('chat/<uuid:bot_id>/', views.ChatView.as_view(), name='chat'),
     path('chat/<uuid:bot_id>/send/', views.SendMessageView.as_view(), name='send_message'),
+    path('chat/<uuid:bot_id>/history/', views.ChatHistoryView.as_view(), name='chat_history'),
     path('chat/<uuid:bot_id>/clear/', views.ClearConversationView.as_view(), name='clear_conversation'),
 ]
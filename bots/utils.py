@@ -1,5 +1,7 @@
 import uuid
 import os
+import time
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.conf import settings
 import logging
@@ -9,7 +11,7 @@ logger = logging.getLogger(__name__)
 
 def generate_session_id():
     """Generate a unique session ID for conversations"""
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
 
 
 
@@ -25,22 +27,23 @@ def save_audio_file(audio_data, filename):
         str: Path to saved file or None if failed
     """
     try:
-        # Ensure audio directory exists
-        audio_dir = os.path.join(settings.MEDIA_ROOT, 'audio')
-        os.makedirs(audio_dir, exist_ok=True)
-        
+        # No os.makedirs() here: the storage backend creates the audio
+        # directory itself the first time a file is saved into it
+
         # Generate unique filename if needed
         if not filename.endswith('.mp3'):
             filename += '.mp3'
         
         file_path = os.path.join('audio', filename)
         
-        # Save file
+        # Save file; storage backends need a File object, not raw bytes
+        if isinstance(audio_data, (bytes, bytearray)):
+            audio_data = ContentFile(audio_data)
         saved_path = default_storage.save(file_path, audio_data)
         return saved_path
         
     except Exception as e:
-        logger.error(f"Error saving audio file: {str(e)}")
+        logger.error("Error saving audio file: %s", e)
         return None
 
 
@@ -50,27 +53,33 @@ def cleanup_old_audio_files(days_old=7):
     
     Args:
         days_old (int): Number of days after which to delete files
+
+    Returns:
+        int: Number of files deleted
     """
+    deleted = 0
     try:
-        from datetime import datetime, timedelta
-
-        cutoff_date = datetime.now() - timedelta(days=days_old)
+        # Compare raw modification times against a single cutoff timestamp
+        cutoff_timestamp = time.time() - days_old * 86400
         audio_dir = os.path.join(settings.MEDIA_ROOT, 'audio')
         
         if os.path.exists(audio_dir):
-            for filename in os.listdir(audio_dir):
-                file_path = os.path.join(audio_dir, filename)
-                if os.path.isfile(file_path):
-                    file_modified = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    if file_modified < cutoff_date:
+            # scandir() reuses the directory listing's file type information,
+            # so each file costs at most one stat() call
+            with os.scandir(audio_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff_timestamp:
                         try:
-                            os.remove(file_path)
-                            logger.info(f"Deleted old audio file: {filename}")
+                            os.remove(entry.path)
+                            deleted += 1
+                            logger.info("Deleted old audio file: %s", entry.name)
                         except Exception as e:
-                            logger.error(f"Error deleting file {filename}: {str(e)}")
+                            logger.error("Error deleting file %s: %s", entry.name, e)
                             
     except Exception as e:
-        logger.error(f"Error during audio cleanup: {str(e)}")
+        logger.error("Error during audio cleanup: %s", e)
+
+    return deleted
 
 
 
@@ -82,6 +91,9 @@ def truncate_text(text, max_length=100):
     """
     Truncate text to specified length with ellipsis
 
+    Uses the single "…" character, like Django's truncatechars filter, so
+    truncated text keeps all but one of its max_length characters.
+
     Args:
         text (str): Text to truncate
         max_length (int): Maximum length
@@ -89,9 +101,7 @@ def truncate_text(text, max_length=100):
     Returns:
         str: Truncated text
     """
-    if len(text) <= max_length:
-        return text
-    return text[:max_length-3] + "..."
+    return text if len(text) <= max_length else text[:max_length - 1] + "…"
 
 
 
@@ -2,12 +2,14 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.views import View
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponseBadRequest, Http404
 from django.contrib import messages
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
 
 # Standard library imports
 import json
@@ -15,15 +17,47 @@ import uuid
 import logging
 
 # Local application imports
-from .models import ConversationalBot, Conversation, Message
+from .models import ConversationalBot, Conversation
 from .forms import BotCreateForm, BotEditForm, ChatMessageForm
-from .services import ConversationManager, VoiceSelectionService
+from .services import VoiceSelectionService, get_conversation_manager
+from .signals import invalidate_view_cache
 from .utils import generate_session_id
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
+def conversation_session_key(bot_id):
+    """Browser-session key holding the visitor's conversation session ID for a bot"""
+    return f'conversation_{bot_id}'
 
+
+# Chat messages rendered per page load or "load earlier messages" request
+CHAT_HISTORY_PAGE_SIZE = 50
+
+
+def get_chat_history_page(messages_qs):
+    """
+    Return the newest page of a conversation's messages.
+
+    Fetches one row past the page size to learn whether older messages
+    exist without running a separate COUNT query.
+
+    Args:
+        messages_qs: Message queryset, e.g. conversation.messages.all()
+
+    Returns:
+        tuple: (list of up to CHAT_HISTORY_PAGE_SIZE messages in
+        chronological order, bool - whether older messages exist)
+    """
+    page = list(messages_qs.order_by('-timestamp')[:CHAT_HISTORY_PAGE_SIZE + 1])
+    has_older = len(page) > CHAT_HISTORY_PAGE_SIZE
+    return page[:CHAT_HISTORY_PAGE_SIZE][::-1], has_older
+
+
+# Cache the rendered bot list per session cookie; bot changes clear the cache
+# (see bots.signals). The 'views' cache must be shared by all workers, or
+# the others keep serving the old list until it expires
+@method_decorator([vary_on_cookie, cache_page(60 * 5, cache='views')], name='dispatch')
 class BotListView(ListView):
     """
     Display all active conversational bots in a paginated list.
@@ -43,10 +77,18 @@ class BotListView(ListView):
         """
         Return only active bots, ordered by creation date (newest first).
 
+        Only the columns the bot cards display are loaded; keep this list in
+        sync with bots/bot_list.html, since reading a deferred field costs an
+        extra query per bot.
+
         Returns:
             QuerySet: Active ConversationalBot objects ordered by creation date
         """
-        return ConversationalBot.objects.filter(is_active=True).order_by('-created_at')
+        return (
+            ConversationalBot.objects.filter(is_active=True)
+            .only('id', 'name', 'system_prompt', 'temperature', 'created_at')
+            .order_by('-created_at')
+        )
 
     def get_context_data(self, **kwargs):
         """
@@ -85,10 +127,11 @@ class BotCreateView(CreateView):
         Process valid form submission with AI voice selection.
 
         This method is called when the form passes validation. It:
-        1. Uses AI to select the most appropriate voice for the bot
+        1. Picks a voice right away (cached AI choice or rule-based)
         2. Saves the bot with the selected voice
         3. Shows success message with voice selection details
-        4. Redirects to chat interface
+        4. Starts AI voice selection in the background if still needed
+        5. Redirects to chat interface
 
         Args:
             form: Valid BotCreateForm instance
@@ -99,10 +142,11 @@ class BotCreateView(CreateView):
         # Get the bot instance from the form (not yet saved to database)
         bot = form.instance
 
-        # Use AI service to automatically select the best voice
-        # This analyzes both the bot name and system prompt to choose
-        # from 4 high-quality Google Cloud TTS voices
-        selected_voice = VoiceSelectionService.select_voice_for_bot(
+        # Pick a voice without waiting on the AI: a cached AI selection or a
+        # rule-based one. The AI analyzes both the bot name and system prompt
+        # to choose from 4 high-quality Google Cloud TTS voices in the
+        # background once the bot is saved
+        selected_voice, is_final = VoiceSelectionService.quick_select_voice(
             bot.name,
             bot.system_prompt
         )
@@ -112,13 +156,22 @@ class BotCreateView(CreateView):
         voice_name = VoiceSelectionService.get_voice_name(selected_voice)
 
         # Show success message with AI voice selection details
+        if is_final:
+            voice_note = f'AI selected voice: {voice_name}'
+        else:
+            voice_note = f'Voice: {voice_name} (AI voice selection finishing in the background)'
         messages.success(
             self.request,
-            f'Bot "{bot.name}" created successfully! AI selected voice: {voice_name}. Starting chat...'
+            f'Bot "{bot.name}" created successfully! {voice_note}. Starting chat...'
         )
 
         # Call parent method to save the bot and handle redirect
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if not is_final:
+            VoiceSelectionService.select_voice_in_background(
+                bot.pk, bot.name, bot.system_prompt, selected_voice
+            )
+        return response
 
     def get_success_url(self):
         """
@@ -174,9 +227,9 @@ class BotEditView(UpdateView):
         """
         Process valid form submission with voice re-selection.
 
-        When a bot is updated, the AI voice selection service re-analyzes
-        the bot's characteristics to ensure the voice still matches the
-        updated personality and role.
+        When a bot's name or system prompt is updated, the AI voice selection
+        service re-analyzes the bot's characteristics to ensure the voice
+        still matches the updated personality and role.
 
         Args:
             form: Valid BotEditForm instance
@@ -187,25 +240,39 @@ class BotEditView(UpdateView):
         # Get the updated bot instance
         bot = form.instance
 
-        # Re-run AI voice selection in case the bot's characteristics changed
+        # Re-run AI voice selection only if the bot's characteristics changed
         # This ensures the voice remains appropriate for the updated bot
-        selected_voice = VoiceSelectionService.select_voice_for_bot(
-            bot.name,
-            bot.system_prompt
-        )
-        bot.voice_name = selected_voice
+        # without an AI call for edits that only touch e.g. temperature
+        # (the AI call itself runs in the background, as in BotCreateView)
+        if bot.voice_name and not {'name', 'system_prompt'} & set(form.changed_data):
+            selected_voice, is_final = bot.voice_name, True
+        else:
+            selected_voice, is_final = VoiceSelectionService.quick_select_voice(
+                bot.name,
+                bot.system_prompt
+            )
+            bot.voice_name = selected_voice
 
         # Get human-readable voice name for user feedback
         voice_name = VoiceSelectionService.get_voice_name(selected_voice)
 
         # Show success message with voice selection details
+        if is_final:
+            voice_note = f'AI selected voice: {voice_name}'
+        else:
+            voice_note = f'Voice: {voice_name} (AI voice selection finishing in the background)'
         messages.success(
             self.request,
-            f'Bot "{bot.name}" updated successfully! AI selected voice: {voice_name}'
+            f'Bot "{bot.name}" updated successfully! {voice_note}'
         )
 
         # Call parent method to save changes and handle redirect
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if not is_final:
+            VoiceSelectionService.select_voice_in_background(
+                bot.pk, bot.name, bot.system_prompt, selected_voice
+            )
+        return response
 
     def form_invalid(self, form):
         """
@@ -237,27 +304,30 @@ class BotDeleteView(DeleteView):
     success_url = reverse_lazy('bot_list')
     context_object_name = 'bot'
 
-    def delete(self, request, *args, **kwargs):
+    def form_valid(self, form):
         """
         Perform soft delete of the bot.
 
         Instead of actually deleting the bot from the database, this method
         marks it as inactive. This preserves all conversation history and
-        allows for potential recovery if needed.
+        allows for potential recovery if needed. (DeleteView.post() calls
+        form_valid(), not delete(), so this is where the delete is handled.)
 
         Args:
-            request: HTTP request object
-            *args: Additional positional arguments
-            **kwargs: Additional keyword arguments
+            form: The confirmation form (carries no data)
 
         Returns:
             HttpResponseRedirect: Redirect to bot list
         """
-        bot = self.get_object()
-        bot.is_active = False  # Soft delete - preserve data but hide from users
-        bot.save()
+        # Soft delete - preserve data but hide from users. A single-column
+        # UPDATE; update() bypasses auto_now and post_save, so stamp
+        # updated_at and drop cached pages here
+        ConversationalBot.objects.filter(pk=self.object.pk).update(
+            is_active=False, updated_at=timezone.now()
+        )
+        invalidate_view_cache(sender=ConversationalBot)
 
-        messages.success(request, f'Bot "{bot.name}" deleted successfully!')
+        messages.success(self.request, f'Bot "{self.object.name}" deleted successfully!')
         return redirect(self.success_url)
 
 
@@ -270,7 +340,7 @@ class ChatView(View):
     real-time chat experience with both text and voice capabilities.
 
     Template: bots/chat.html
-    Context: bot, conversation, messages, form, session_id
+    Context: bot, conversation, chat_messages, has_older_messages, form, session_id
     """
     template_name = 'bots/chat.html'
 
@@ -279,10 +349,11 @@ class ChatView(View):
         Display the chat interface for a specific bot.
 
         This method:
-        1. Retrieves the bot or returns 404 if not found/inactive
-        2. Manages conversation sessions using browser session storage
-        3. Creates or retrieves existing conversation
-        4. Loads message history for context
+        1. Manages conversation sessions using browser session storage
+        2. Retrieves the existing conversation and its bot in one query
+        3. Otherwise retrieves the bot (404 if not found/inactive) and
+           creates the conversation
+        4. Loads the most recent page of message history
         5. Provides form for new messages
 
         Args:
@@ -292,35 +363,51 @@ class ChatView(View):
         Returns:
             HttpResponse: Rendered chat interface
         """
-        # Get the bot or return 404 if not found or inactive
-        bot = get_object_or_404(ConversationalBot, id=bot_id, is_active=True)
-
         # Session management: Get or create conversation session
         # This allows conversation persistence across browser sessions
-        session_key = f'conversation_{bot_id}'
+        session_key = conversation_session_key(bot_id)
         session_id = request.session.get(session_key)
+        conversation = None
+
+        if session_id:
+            # Returning visitor: load the conversation and its bot in one
+            # joined query instead of a bot lookup plus get_or_create
+            conversation = Conversation.objects.select_related('bot').filter(
+                bot_id=bot_id,
+                bot__is_active=True,
+                session_uuid=Conversation.uuid_for_session(session_id)
+            ).first()
+
+        if conversation is not None:
+            bot = conversation.bot
+        else:
+            # Get the bot or return 404 if not found or inactive
+            bot = get_object_or_404(ConversationalBot, id=bot_id, is_active=True)
 
-        if not session_id:
-            # Generate new session ID for first-time visitors
-            session_id = generate_session_id()
-            request.session[session_key] = session_id
-
-        # Get or create conversation record in database
-        conversation, created = Conversation.objects.get_or_create(
-            bot=bot,
-            session_id=session_id,
-            defaults={'is_active': True}
-        )
+            if not session_id:
+                # Generate new session ID for first-time visitors
+                session_id = generate_session_id()
+                request.session[session_key] = session_id
 
-        # Load message history for this conversation
-        # Ordered chronologically to maintain conversation flow
-        messages_list = conversation.messages.order_by('timestamp')
+            # Get or create conversation record in database
+            conversation, created = Conversation.objects.get_or_create(
+                bot=bot,
+                session_uuid=Conversation.uuid_for_session(session_id),
+                defaults={'session_id': session_id, 'is_active': True}
+            )
+
+        # Load only the latest page of history; older messages are fetched
+        # on demand through ChatHistoryView
+        messages_list, has_older = get_chat_history_page(conversation.messages.all())
 
         # Prepare context for template rendering
+        # (history is not passed as 'messages', which base.html renders as
+        # flash messages)
         context = {
             'bot': bot,                    # Bot configuration and details
             'conversation': conversation,   # Current conversation session
-            'messages': messages_list,     # Historical messages
+            'chat_messages': messages_list,  # Historical messages
+            'has_older_messages': has_older,  # Show "load earlier messages"
             'form': ChatMessageForm(),     # Form for new messages
             'session_id': session_id       # Session ID for AJAX requests
         }
@@ -328,13 +415,56 @@ class ChatView(View):
         return render(request, self.template_name, context)
 
 
+class ChatHistoryView(View):
+    """AJAX endpoint returning the page of chat messages before a given message"""
+
+    def get(self, request, bot_id):
+        session_id = request.session.get(conversation_session_key(bot_id))
+        try:
+            before_id = uuid.UUID(request.GET.get('before', ''))
+        except ValueError:
+            return HttpResponseBadRequest('Invalid message id')
+
+        if not session_id:
+            return HttpResponseBadRequest('Invalid session')
+
+        # Only the conversation tied to this browser session can be read
+        conversation = get_object_or_404(
+            Conversation.objects.select_related('bot'),
+            bot_id=bot_id,
+            bot__is_active=True,
+            session_uuid=Conversation.uuid_for_session(session_id),
+            is_active=True
+        )
+        before = conversation.messages.filter(id=before_id).values_list('timestamp', flat=True).first()
+        if before is None:
+            raise Http404('Message not found')
+
+        messages_list, has_older = get_chat_history_page(
+            conversation.messages.filter(timestamp__lt=before)
+        )
+
+        return render(request, 'includes/chat_history.html', {
+            'bot': conversation.bot,
+            'chat_messages': messages_list,
+            'has_older_messages': has_older,
+        })
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SendMessageView(View):
     """AJAX endpoint for chat messages"""
 
+    # Largest accepted request body; the chat input caps messages at 1000
+    # characters, so real requests are a few KB at most
+    max_body_bytes = 64 * 1024
+
     def post(self, request, bot_id):
         try:
-            bot = get_object_or_404(ConversationalBot, id=bot_id, is_active=True)
+            # Reject oversized bodies from the header, before reading them
+            # into memory
+            if int(request.META.get('CONTENT_LENGTH') or 0) > self.max_body_bytes:
+                return JsonResponse({'success': False, 'error': 'Message too large'}, status=413)
 
             # Parse JSON data
             data = json.loads(request.body)
@@ -347,16 +477,18 @@ class SendMessageView(View):
             if not session_id:
                 return JsonResponse({'success': False, 'error': 'Invalid session'})
 
-            # Get conversation
+            # Get conversation and its (active) bot in one query; the bot's
+            # prompt, temperature and voice are needed to generate the reply
             conversation = get_object_or_404(
-                Conversation,
-                bot=bot,
-                session_id=session_id,
+                Conversation.objects.select_related('bot'),
+                bot_id=bot_id,
+                bot__is_active=True,
+                session_uuid=Conversation.uuid_for_session(session_id),
                 is_active=True
             )
 
-            # Process message using ConversationManager
-            conversation_manager = ConversationManager()
+            # Process message using the shared ConversationManager
+            conversation_manager = get_conversation_manager()
             result = conversation_manager.process_user_message(conversation, message_text)
 
             if result['success']:
@@ -399,18 +531,19 @@ class ClearConversationView(View):
     def post(self, request, bot_id):
         try:
             bot = get_object_or_404(ConversationalBot, id=bot_id, is_active=True)
-            session_id = request.session.get(f'conversation_{bot_id}')
+            session_key = conversation_session_key(bot_id)
+            session_id = request.session.get(session_key)
 
             if session_id:
                 # Mark old conversation as inactive
                 Conversation.objects.filter(
                     bot=bot,
-                    session_id=session_id
+                    session_uuid=Conversation.uuid_for_session(session_id)
                 ).update(is_active=False)
 
                 # Create new session
                 new_session_id = generate_session_id()
-                request.session[f'conversation_{bot_id}'] = new_session_id
+                request.session[session_key] = new_session_id
 
                 messages.success(request, 'Conversation cleared successfully!')
 
@@ -19,23 +19,35 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import logging
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
 
+# Startup messages (database selection) go through logging rather than
+# print(). They run before LOGGING below is applied, so only the fallback
+# warnings reach stderr; the informational lines are dropped
+logger = logging.getLogger(__name__)
+
 # ========================================
 # ENVIRONMENT AND PATH CONFIGURATION
 # ========================================
 
-# Load environment variables from .env file for local development
-# This allows secure configuration without hardcoding sensitive values
-load_dotenv()
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'
 # This is the root directory of the Django project
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from .env file for local development
+# This allows secure configuration without hardcoding sensitive values
+# Only the project's own .env is read (no search through parent directories),
+# and variables already set in the environment take precedence, so production
+# deployments without a .env file skip dotenv parsing entirely
+_dotenv_path = BASE_DIR / '.env'
+if _dotenv_path.is_file():
+    load_dotenv(_dotenv_path, override=False)
+
 # ========================================
 # SECURITY CONFIGURATION
 # ========================================
@@ -50,7 +62,12 @@ DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
 
 # Allowed hosts for the application
 # In production, this should be set to your domain names
-ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+# Comma-separated; spaces around names and empty entries are ignored
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+    if host.strip()
+]
 
 # ========================================
 # EXTERNAL API CONFIGURATION
@@ -65,6 +82,10 @@ GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 # Required for voice synthesis functionality
 GOOGLE_CLOUD_API_KEY = os.getenv('GOOGLE_CLOUD_API_KEY')
 
+# Audio encoding for synthesized speech: 'MP3' (default, plays in every
+# browser) or 'OGG_OPUS' (2-3x smaller files, but older Safari can't play it)
+GOOGLE_TTS_AUDIO_ENCODING = os.getenv('GOOGLE_TTS_AUDIO_ENCODING', 'MP3')
+
 # Legacy authentication methods (NO LONGER NEEDED with API key)
 # These are kept commented for reference but not used in current implementation
 # GOOGLE_CLOUD_PROJECT = os.getenv('GOOGLE_CLOUD_PROJECT')
@@ -118,64 +139,132 @@ WSGI_APPLICATION = 'conversational_ai_builder.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Check if psycopg2 is available
-PSYCOPG2_AVAILABLE = False
-try:
-    import psycopg2
-    PSYCOPG2_AVAILABLE = True
-except ImportError:
-    print("Info: psycopg2 not available. Using SQLite for local development.")
+# Check if a PostgreSQL driver (psycopg2, or psycopg 3 which Django also
+# supports) is available. find_spec() only locates the package; the driver
+# and libpq are loaded by Django's backend when PostgreSQL is actually used
+PSYCOPG2_AVAILABLE = find_spec('psycopg2') is not None or find_spec('psycopg') is not None
+if not PSYCOPG2_AVAILABLE:
+    logger.info("psycopg2 not available. Using SQLite for local development.")
+
+# Keep PostgreSQL connections open between requests (seconds) instead of
+# paying the TCP + TLS + auth handshake to Supabase on every request; health
+# checks replace a connection that went stale while idle. 0 disables reuse.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+
+# Local SQLite database, used by default and whenever PostgreSQL can't be
+# configured. WAL mode lets page loads read while a chat turn is being
+# written, synchronous=NORMAL is safe with WAL and skips an fsync per commit,
+# and IMMEDIATE transactions take the write lock up front so concurrent
+# writers wait for it instead of failing with "database is locked"
+SQLITE_DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
 
 # Use PostgreSQL (Supabase) if DATABASE_URL is provided and psycopg2 is available
+# (each database variable is read from the environment once)
 DATABASE_URL = os.getenv('DATABASE_URL')
+DB_NAME = os.getenv('DB_NAME')
 if DATABASE_URL and PSYCOPG2_AVAILABLE:
     try:
         DATABASES = {
-            'default': dj_database_url.parse(DATABASE_URL)
+            'default': dj_database_url.parse(
+                DATABASE_URL,
+                conn_max_age=DB_CONN_MAX_AGE,
+                conn_health_checks=True,
+            )
         }
-        print("Using PostgreSQL database from DATABASE_URL")
+        logger.info("Using PostgreSQL database from DATABASE_URL")
     except Exception as e:
-        print(f"Error parsing DATABASE_URL: {e}. Falling back to SQLite.")
-        DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.sqlite3',
-                'NAME': BASE_DIR / 'db.sqlite3',
-            }
-        }
-elif os.getenv('DB_NAME') and PSYCOPG2_AVAILABLE:
+        logger.warning("Error parsing DATABASE_URL: %s. Falling back to SQLite.", e)
+        DATABASES = SQLITE_DATABASES
+elif DB_NAME and PSYCOPG2_AVAILABLE:
     # Individual database settings (alternative to DATABASE_URL)
     try:
         DATABASES = {
             'default': {
                 'ENGINE': 'django.db.backends.postgresql',
-                'NAME': os.getenv('DB_NAME'),
+                'NAME': DB_NAME,
                 'USER': os.getenv('DB_USER'),
                 'PASSWORD': os.getenv('DB_PASSWORD'),
                 'HOST': os.getenv('DB_HOST'),
                 'PORT': os.getenv('DB_PORT', '5432'),
+                'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+                'CONN_HEALTH_CHECKS': True,
                 'OPTIONS': {
                     'sslmode': 'require',
                 },
             }
         }
-        print("Using PostgreSQL database from individual settings")
+        logger.info("Using PostgreSQL database from individual settings")
     except Exception as e:
-        print(f"Error configuring PostgreSQL: {e}. Using SQLite for development.")
-        DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.sqlite3',
-                'NAME': BASE_DIR / 'db.sqlite3',
-            }
-        }
+        logger.warning("Error configuring PostgreSQL: %s. Using SQLite for development.", e)
+        DATABASES = SQLITE_DATABASES
 else:
     # Default to SQLite for local development
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-        }
-    }
-    print("Using SQLite database for local development")
+    DATABASES = SQLITE_DATABASES
+    logger.info("Using SQLite database for local development")
+
+
+# Cache configuration
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Rendered pages from per-view caching; cleared whenever a bot changes.
+    # File-based, under this checkout by default, so every worker of this
+    # deployment sees the same entries and the same clear() without touching
+    # other projects on the host; deployments spread over several hosts need
+    # a shared backend such as Redis here
+    'views': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('VIEWS_CACHE_DIR', str(BASE_DIR / 'cache' / 'views')),
+    },
+    # Synthesized MP3 audio keyed by voice and text, so repeated AI replies
+    # skip the Google Cloud TTS call. Kept on disk rather than in memory so
+    # the audio doesn't add to each worker's RSS, hits are shared between
+    # workers and entries survive restarts
+    'tts': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('TTS_CACHE_DIR', str(BASE_DIR / 'cache' / 'tts')),
+        'TIMEOUT': 30 * 24 * 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 500},
+    },
+}
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+
+# Project and app loggers write to the console: INFO and up while
+# developing, only warnings and errors in production
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'conversational_ai_builder': {
+            'handlers': ['console'],
+            'level': 'INFO' if DEBUG else 'WARNING',
+        },
+        'bots': {
+            'handlers': ['console'],
+            'level': 'INFO' if DEBUG else 'WARNING',
+        },
+    },
+}
 
 
 # Password validation
@@ -218,8 +307,17 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# WhiteNoise configuration for static files in production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Storage backends: uploaded/generated media on the local filesystem, and
+# WhiteNoise's compressed, content-hashed static files in production
+# (Django 5.1+ only reads the STORAGES setting, not STATICFILES_STORAGE)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 # Media files (User uploads, generated audio files)
 MEDIA_URL = '/media/'
@@ -227,11 +325,9 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 # Security settings for production
 if not DEBUG:
-    SECURE_BROWSER_XSS_FILTER = True
     SECURE_CONTENT_TYPE_NOSNIFF = True
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_SECONDS = 31536000
-    SECURE_REDIRECT_EXEMPT = []
     SECURE_SSL_REDIRECT = True
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
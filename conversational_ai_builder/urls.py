@@ -10,8 +10,8 @@ URL Structure:
 - / - All other URLs handled by bots.urls (bot management, chat interface)
 
 Static and Media Files:
-- In development: Django serves static and media files directly
-- In production: WhiteNoise middleware handles static files, media files served by web server
+- Static files: WhiteNoise middleware serves them in development and production
+- Media files: Django serves them in development, the web server in production
 
 For more information on Django URL configuration:
 https://docs.djangoproject.com/en/5.2/topics/http/urls/
@@ -40,12 +40,10 @@ urlpatterns = [
 # DEVELOPMENT STATIC FILE SERVING
 # ========================================
 
-# Serve media and static files during development
+# Serve media files during development
 # In production, these are handled by the web server (nginx/apache) or CDN
 if settings.DEBUG:
     # Serve uploaded media files (audio files, user uploads)
+    # Static files need no URL pattern: WhiteNoise middleware serves them in
+    # development too, straight from the app and STATICFILES_DIRS folders
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
-    # Serve static files (CSS, JavaScript, images)
-    # Note: In production, WhiteNoise middleware handles this
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
@@ -10,7 +10,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conversational_ai_builder.settings')
 
 application = get_wsgi_application()
+
+# Load the URLconf at startup instead of on the first request. It imports the
+# bots views and services, and through them the Azure AI SDK, so the first
+# chat request doesn't pay for those imports. Under `gunicorn --preload` this
+# runs once in the master process and the forked workers share the result.
+get_resolver().url_patterns
@@ -505,12 +505,58 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    // Handle existing audio buttons
-    document.querySelectorAll('.play-audio-btn').forEach(button => {
-        button.addEventListener('click', function() {
-            const audioUrl = this.getAttribute('data-audio-url');
-            playAudio(audioUrl, this);
+    // Handle audio buttons rendered by the server
+    function bindAudioButtons(root) {
+        root.querySelectorAll('.play-audio-btn').forEach(button => {
+            button.addEventListener('click', function() {
+                const audioUrl = this.getAttribute('data-audio-url');
+                playAudio(audioUrl, this);
+            });
         });
+    }
+
+    bindAudioButtons(document);
+
+    // ========================================
+    // EARLIER MESSAGE LOADING
+    // ========================================
+
+    /**
+     * Only the latest page of history is rendered with the chat page.
+     * "Load earlier messages" fetches the previous page as server-rendered
+     * HTML and prepends it, keeping the current scroll position.
+     */
+    messagesContainer.addEventListener('click', function(e) {
+        const loadBtn = e.target.closest('.load-older-btn');
+        if (!loadBtn) {
+            return;
+        }
+
+        loadBtn.disabled = true;
+        const before = encodeURIComponent(loadBtn.dataset.before);
+
+        fetch(`/chat/${botId}/history/?before=${before}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.text();
+            })
+            .then(html => {
+                const page = document.createElement('template');
+                page.innerHTML = html;
+                bindAudioButtons(page.content);
+
+                const previousHeight = messagesContainer.scrollHeight;
+                loadBtn.closest('.load-older-messages').remove();
+                messagesContainer.prepend(page.content);
+                messagesContainer.scrollTop += messagesContainer.scrollHeight - previousHeight;
+            })
+            .catch(error => {
+                console.error('Error loading earlier messages:', error);
+                loadBtn.disabled = false;
+                AIBuilder.showToast('Could not load earlier messages', 'error');
+            });
     });
 
 